@@ -0,0 +1,133 @@
+"""initial schema
+
+Users, accounts and transactions as first shipped; existing databases
+created through create_all can be stamped at this revision.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-15 09:13:48.381214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('username', sa.String(), nullable=False),
+    sa.Column('hashed_password', sa.String(), nullable=False),
+    sa.Column('full_name', sa.String(), nullable=False),
+    sa.Column('cpf', sa.String(length=11), nullable=True),
+    sa.Column('cnpj', sa.String(length=14), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('is_verified', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_cnpj'), 'users', ['cnpj'], unique=True)
+    op.create_index(op.f('ix_users_cpf'), 'users', ['cpf'], unique=True)
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
+    op.create_table('accounts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('account_number', sa.String(), nullable=False),
+    sa.Column('account_type', sa.String(), nullable=False),
+    sa.Column('bank_code', sa.String(length=3), nullable=False),
+    sa.Column('branch_code', sa.String(length=4), nullable=False),
+    sa.Column('balance', sa.Numeric(precision=15, scale=2), nullable=True),
+    sa.Column('daily_limit', sa.Numeric(precision=15, scale=2), nullable=True),
+    sa.Column('monthly_limit', sa.Numeric(precision=15, scale=2), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('is_blocked', sa.Boolean(), nullable=True),
+    sa.Column('pix_key', sa.String(), nullable=True),
+    sa.Column('pix_key_type', sa.String(), nullable=True),
+    sa.Column('iban', sa.String(length=34), nullable=True),
+    sa.Column('swift_code', sa.String(length=11), nullable=True),
+    sa.Column('owner_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_accounts_account_number'), 'accounts', ['account_number'], unique=True)
+    op.create_index(op.f('ix_accounts_iban'), 'accounts', ['iban'], unique=True)
+    op.create_index(op.f('ix_accounts_id'), 'accounts', ['id'], unique=False)
+    op.create_index(op.f('ix_accounts_pix_key'), 'accounts', ['pix_key'], unique=True)
+    op.create_table('transactions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('transaction_id', sa.String(), nullable=False),
+    sa.Column('reference_number', sa.String(), nullable=True),
+    sa.Column('amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('currency', sa.String(length=3), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('transaction_type', sa.Enum('INSTANT_TRANSFER', 'PIX_TRANSFER', 'SEPA_TRANSFER', 'DEPOSIT', 'WITHDRAWAL', name='transactiontype'), nullable=False),
+    sa.Column('status', sa.Enum('PENDING', 'PROCESSING', 'COMPLETED', 'FAILED', 'CANCELLED', name='transactionstatus'), nullable=True),
+    sa.Column('sender_id', sa.Integer(), nullable=True),
+    sa.Column('receiver_id', sa.Integer(), nullable=True),
+    sa.Column('sender_account_id', sa.Integer(), nullable=True),
+    sa.Column('receiver_account_id', sa.Integer(), nullable=True),
+    sa.Column('external_recipient_name', sa.String(), nullable=True),
+    sa.Column('external_recipient_bank', sa.String(), nullable=True),
+    sa.Column('external_recipient_account', sa.String(), nullable=True),
+    sa.Column('external_recipient_document', sa.String(), nullable=True),
+    sa.Column('pix_key', sa.String(), nullable=True),
+    sa.Column('pix_end_to_end_id', sa.String(), nullable=True),
+    sa.Column('sepa_instruction_id', sa.String(), nullable=True),
+    sa.Column('sepa_end_to_end_id', sa.String(), nullable=True),
+    sa.Column('sepa_payment_info_id', sa.String(), nullable=True),
+    sa.Column('processing_fee', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('exchange_rate', sa.Numeric(precision=10, scale=6), nullable=True),
+    sa.Column('risk_score', sa.Numeric(precision=5, scale=2), nullable=True),
+    sa.Column('compliance_check', sa.Boolean(), nullable=True),
+    sa.Column('anti_fraud_check', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('processed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('error_code', sa.String(), nullable=True),
+    sa.Column('error_message', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['receiver_account_id'], ['accounts.id'], ),
+    sa.ForeignKeyConstraint(['receiver_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['sender_account_id'], ['accounts.id'], ),
+    sa.ForeignKeyConstraint(['sender_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_transactions_id'), 'transactions', ['id'], unique=False)
+    op.create_index(op.f('ix_transactions_pix_end_to_end_id'), 'transactions', ['pix_end_to_end_id'], unique=True)
+    op.create_index(op.f('ix_transactions_reference_number'), 'transactions', ['reference_number'], unique=True)
+    op.create_index(op.f('ix_transactions_transaction_id'), 'transactions', ['transaction_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_transactions_transaction_id'), table_name='transactions')
+    op.drop_index(op.f('ix_transactions_reference_number'), table_name='transactions')
+    op.drop_index(op.f('ix_transactions_pix_end_to_end_id'), table_name='transactions')
+    op.drop_index(op.f('ix_transactions_id'), table_name='transactions')
+    op.drop_table('transactions')
+    op.drop_index(op.f('ix_accounts_pix_key'), table_name='accounts')
+    op.drop_index(op.f('ix_accounts_id'), table_name='accounts')
+    op.drop_index(op.f('ix_accounts_iban'), table_name='accounts')
+    op.drop_index(op.f('ix_accounts_account_number'), table_name='accounts')
+    op.drop_table('accounts')
+    op.drop_index(op.f('ix_users_username'), table_name='users')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_index(op.f('ix_users_cpf'), table_name='users')
+    op.drop_index(op.f('ix_users_cnpj'), table_name='users')
+    op.drop_table('users')
+    sa.Enum(name='transactionstatus').drop(op.get_bind())
+    sa.Enum(name='transactiontype').drop(op.get_bind())
\ No newline at end of file
@@ -0,0 +1,76 @@
+"""instant transfer schema
+
+Native enums storing the lowercase values, database-generated UUID
+transaction ids, the daily_spent running totals and the composite
+created_at indexes.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-15 09:14:30.512407
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TX_TYPE_VALUES = ('instant_transfer', 'pix_transfer', 'sepa_transfer', 'deposit', 'withdrawal')
+TX_STATUS_VALUES = ('pending', 'processing', 'completed', 'failed', 'cancelled')
+
+
+def _convert_enum(column: str, old_name: str, new_name: str, values, lower: bool) -> None:
+    """Recreate an enum type with relabelled members and cast the column over"""
+    labels = [value if lower else value.upper() for value in values]
+    postgresql.ENUM(*labels, name=new_name).create(op.get_bind())
+    op.execute(sa.text(f"ALTER TABLE transactions ALTER COLUMN {column} DROP DEFAULT"))
+    op.execute(sa.text(
+        f"ALTER TABLE transactions ALTER COLUMN {column} TYPE {new_name} "
+        f"USING {'lower' if lower else 'upper'}({column}::text)::{new_name}"
+    ))
+    postgresql.ENUM(name=old_name).drop(op.get_bind())
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('daily_spent',
+    sa.Column('account_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], ),
+    sa.PrimaryKeyConstraint('account_id', 'day')
+    )
+    op.alter_column('transactions', 'transaction_id',
+               existing_type=sa.VARCHAR(),
+               type_=sa.Uuid(),
+               existing_nullable=False,
+               server_default=sa.text('gen_random_uuid()'),
+               postgresql_using='transaction_id::uuid')
+    # The old types were labelled with the member names (COMPLETED), the
+    # models now bind the values (completed)
+    _convert_enum('transaction_type', 'transactiontype', 'tx_type', TX_TYPE_VALUES, lower=True)
+    _convert_enum('status', 'transactionstatus', 'tx_status', TX_STATUS_VALUES, lower=True)
+    op.create_index('ix_tx_receiver_created', 'transactions', ['receiver_id', sa.text('created_at DESC')], unique=False)
+    op.create_index('ix_tx_sender_created', 'transactions', ['sender_id', sa.text('created_at DESC')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tx_sender_created', table_name='transactions')
+    op.drop_index('ix_tx_receiver_created', table_name='transactions')
+    _convert_enum('status', 'tx_status', 'transactionstatus', TX_STATUS_VALUES, lower=False)
+    _convert_enum('transaction_type', 'tx_type', 'transactiontype', TX_TYPE_VALUES, lower=False)
+    op.alter_column('transactions', 'transaction_id',
+               existing_type=sa.Uuid(),
+               type_=sa.VARCHAR(),
+               existing_nullable=False,
+               server_default=None,
+               postgresql_using='transaction_id::text')
+    op.drop_table('daily_spent')
\ No newline at end of file
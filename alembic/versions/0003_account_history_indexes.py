@@ -0,0 +1,30 @@
+"""account history indexes
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-15 09:22:47.825383
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_tx_receiver_acct_created', 'transactions', ['receiver_account_id', sa.text('created_at DESC')], unique=False)
+    op.create_index('ix_tx_sender_acct_created', 'transactions', ['sender_account_id', sa.text('created_at DESC')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tx_sender_acct_created', table_name='transactions')
+    op.drop_index('ix_tx_receiver_acct_created', table_name='transactions')
\ No newline at end of file
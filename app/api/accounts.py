@@ -1,87 +1,131 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select, bindparam
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
+from decimal import Decimal
 from app.db.database import get_db
+from app.db.cache import cache_get, cache_set, cache_delete, account_balance_key, user_accounts_key
 from app.models.user import User
 from app.models.account import Account
 from app.schemas.account import AccountCreate, AccountResponse, AccountUpdate
+from app.schemas._fast import response_from_orm
 from app.core.auth import get_current_active_user
-from app.utils.currency import generate_account_number, generate_iban_compatible
+from app.utils.currency import generate_account_number, generate_iban_compatible, format_currency_brl
+from app.utils.validators import validate_pix_key
 
 router = APIRouter()
 
+# Built once at import; requests only bind the ids
+_GET_ACCT = select(Account).where(Account.id == bindparam('aid'), Account.owner_id == bindparam('uid'))
+_GET_USER_ACCTS = select(Account).where(Account.owner_id == bindparam('uid'))
+
+# Attempts at drawing an unused random account number before giving up
+ACCOUNT_NUMBER_ATTEMPTS = 5
+
+def _is_pix_key_conflict(error: IntegrityError) -> bool:
+    """Whether a unique violation was raised by the PIX key constraint"""
+    return "pix_key" in str(error.orig)
+
 @router.post("/", response_model=AccountResponse)
-def create_account(
+async def create_account(
     account: AccountCreate, 
-    db: Session = Depends(get_db), 
+    db: AsyncSession = Depends(get_db), 
     current_user: User = Depends(get_current_active_user)
 ):
     """Create a new account for the current user"""
-    # Generate account number
-    account_number = generate_account_number()
-    
-    # Ensure unique account number
-    while db.query(Account).filter(Account.account_number == account_number).first():
-        account_number = generate_account_number()
-    
-    # Generate IBAN-compatible format
-    iban = generate_iban_compatible(account.bank_code, account.branch_code, account_number)
-    
-    # Create new account
-    db_account = Account(
-        account_number=account_number,
-        account_type=account.account_type,
-        bank_code=account.bank_code,
-        branch_code=account.branch_code,
-        pix_key=account.pix_key,
-        pix_key_type=account.pix_key_type,
-        iban=iban,
-        owner_id=current_user.id
-    )
-    
     # Validate PIX key if provided
     if account.pix_key and account.pix_key_type:
-        from app.utils.validators import validate_pix_key
         if not validate_pix_key(account.pix_key, account.pix_key_type):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid PIX key for the specified type"
             )
+    
+    owner_id = current_user.id
+    
+    # Uniqueness of account number and PIX key is enforced by the unique
+    # constraints at insert time; a colliding random account number is
+    # simply regenerated
+    for _ in range(ACCOUNT_NUMBER_ATTEMPTS):
+        account_number = generate_account_number()
         
-        # Check PIX key uniqueness
-        existing_pix = db.query(Account).filter(Account.pix_key == account.pix_key).first()
-        if existing_pix:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="PIX key already registered"
-            )
+        # Generate IBAN-compatible format
+        iban = generate_iban_compatible(account.bank_code, account.branch_code, account_number)
+        
+        # Create new account
+        db_account = Account(
+            account_number=account_number,
+            account_type=account.account_type,
+            bank_code=account.bank_code,
+            branch_code=account.branch_code,
+            pix_key=account.pix_key,
+            pix_key_type=account.pix_key_type,
+            iban=iban,
+            owner_id=owner_id
+        )
+        
+        db.add(db_account)
+        try:
+            await db.commit()
+            break
+        except IntegrityError as e:
+            await db.rollback()
+            if _is_pix_key_conflict(e):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="PIX key already registered"
+                )
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Could not allocate an account number"
+        )
     
-    db.add(db_account)
-    db.commit()
-    db.refresh(db_account)
+    await db.refresh(db_account)
+    await cache_delete(user_accounts_key(owner_id))
     
     return db_account
 
 @router.get("/", response_model=List[AccountResponse])
-def get_user_accounts(
-    db: Session = Depends(get_db), 
+async def get_user_accounts(
+    db: AsyncSession = Depends(get_db), 
     current_user: User = Depends(get_current_active_user)
 ):
     """Get all accounts for the current user"""
-    accounts = db.query(Account).filter(Account.owner_id == current_user.id).all()
+    cache_key = user_accounts_key(current_user.id)
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return cached
+    
+    result = await db.execute(_GET_USER_ACCTS, {'uid': current_user.id})
+    accounts = result.scalars().all()
+    
+    await cache_set(cache_key, [
+        response_from_orm(AccountResponse, account).model_dump(mode="json") for account in accounts
+    ])
     return accounts
 
 @router.get("/{account_id}", response_model=AccountResponse)
-def get_account(
+async def get_account(
     account_id: int, 
-    db: Session = Depends(get_db), 
+    db: AsyncSession = Depends(get_db), 
     current_user: User = Depends(get_current_active_user)
 ):
     """Get specific account by ID"""
-    account = db.query(Account).filter(
-        Account.id == account_id, 
-        Account.owner_id == current_user.id
-    ).first()
+    # The cached account list is authoritative for the user while it lives
+    cached = await cache_get(user_accounts_key(current_user.id))
+    if cached is not None:
+        for cached_account in cached:
+            if cached_account["id"] == account_id:
+                return cached_account
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Account not found"
+        )
+    
+    result = await db.execute(_GET_ACCT, {'aid': account_id, 'uid': current_user.id})
+    account = result.scalar_one_or_none()
     
     if not account:
         raise HTTPException(
@@ -92,17 +136,15 @@ def get_account(
     return account
 
 @router.put("/{account_id}", response_model=AccountResponse)
-def update_account(
+async def update_account(
     account_id: int,
     account_update: AccountUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Update account information"""
-    account = db.query(Account).filter(
-        Account.id == account_id,
-        Account.owner_id == current_user.id
-    ).first()
+    result = await db.execute(_GET_ACCT, {'aid': account_id, 'uid': current_user.id})
+    account = result.scalar_one_or_none()
     
     if not account:
         raise HTTPException(
@@ -113,24 +155,12 @@ def update_account(
     # Update fields if provided
     if account_update.pix_key is not None:
         if account_update.pix_key_type:
-            from app.utils.validators import validate_pix_key
             if not validate_pix_key(account_update.pix_key, account_update.pix_key_type):
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Invalid PIX key for the specified type"
                 )
         
-        # Check PIX key uniqueness
-        existing_pix = db.query(Account).filter(
-            Account.pix_key == account_update.pix_key,
-            Account.id != account_id
-        ).first()
-        if existing_pix:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="PIX key already registered"
-            )
-        
         account.pix_key = account_update.pix_key
     
     if account_update.pix_key_type is not None:
@@ -145,34 +175,55 @@ def update_account(
     if account_update.is_active is not None:
         account.is_active = account_update.is_active
     
-    db.commit()
-    db.refresh(account)
+    # PIX key uniqueness is enforced by the unique constraint
+    try:
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        if _is_pix_key_conflict(e):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="PIX key already registered"
+            )
+        raise
+    await db.refresh(account)
+    await cache_delete(user_accounts_key(current_user.id))
     
     return account
 
 @router.get("/{account_id}/balance")
-def get_account_balance(
+async def get_account_balance(
     account_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get account balance"""
-    account = db.query(Account).filter(
-        Account.id == account_id,
-        Account.owner_id == current_user.id
-    ).first()
+    cache_key = account_balance_key(account_id)
+    cached = await cache_get(cache_key)
     
-    if not account:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Account not found"
-        )
-    
-    from app.utils.currency import format_currency_brl
+    if cached is not None:
+        if cached["owner_id"] != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Account not found"
+            )
+        balance = Decimal(cached["balance"])
+    else:
+        result = await db.execute(_GET_ACCT, {'aid': account_id, 'uid': current_user.id})
+        account = result.scalar_one_or_none()
+        
+        if not account:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Account not found"
+            )
+        
+        balance = account.balance
+        await cache_set(cache_key, {"owner_id": account.owner_id, "balance": balance})
     
     return {
-        "account_id": account.id,
-        "balance": account.balance,
-        "formatted_balance": format_currency_brl(account.balance),
+        "account_id": account_id,
+        "balance": balance,
+        "formatted_balance": format_currency_brl(balance),
         "currency": "BRL"
     }
\ No newline at end of file
@@ -1,5 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select, exists
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.database import get_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse, UserLogin, Token
@@ -9,15 +11,15 @@ from app.core.auth import get_current_active_user
 router = APIRouter()
 
 @router.post("/register", response_model=UserResponse)
-def register_user(user: UserCreate, db: Session = Depends(get_db)):
+async def register_user(user: UserCreate, db: AsyncSession = Depends(get_db)):
     """Register a new user"""
     # Check if user already exists
-    db_user = db.query(User).filter(
+    user_exists = (await db.execute(select(exists().where(
         (User.email == user.email) | 
         (User.username == user.username)
-    ).first()
+    )))).scalar()
     
-    if db_user:
+    if user_exists:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email or username already registered"
@@ -25,8 +27,8 @@ def register_user(user: UserCreate, db: Session = Depends(get_db)):
     
     # Check CPF uniqueness if provided
     if user.cpf:
-        cpf_user = db.query(User).filter(User.cpf == user.cpf).first()
-        if cpf_user:
+        cpf_exists = (await db.execute(select(exists().where(User.cpf == user.cpf)))).scalar()
+        if cpf_exists:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="CPF already registered"
@@ -34,15 +36,15 @@ def register_user(user: UserCreate, db: Session = Depends(get_db)):
     
     # Check CNPJ uniqueness if provided
     if user.cnpj:
-        cnpj_user = db.query(User).filter(User.cnpj == user.cnpj).first()
-        if cnpj_user:
+        cnpj_exists = (await db.execute(select(exists().where(User.cnpj == user.cnpj)))).scalar()
+        if cnpj_exists:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="CNPJ already registered"
             )
     
-    # Create new user
-    hashed_password = get_password_hash(user.password)
+    # Create new user (bcrypt is CPU-bound, keep it off the event loop)
+    hashed_password = await run_in_threadpool(get_password_hash, user.password)
     db_user = User(
         email=user.email,
         username=user.username,
@@ -53,17 +55,18 @@ def register_user(user: UserCreate, db: Session = Depends(get_db)):
     )
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     
     return db_user
 
 @router.post("/login", response_model=Token)
-def login_user(user_credentials: UserLogin, db: Session = Depends(get_db)):
+async def login_user(user_credentials: UserLogin, db: AsyncSession = Depends(get_db)):
     """Login user and return access token"""
-    user = db.query(User).filter(User.email == user_credentials.email).first()
+    result = await db.execute(select(User).where(User.email == user_credentials.email))
+    user = result.scalar_one_or_none()
     
-    if not user or not verify_password(user_credentials.password, user.hashed_password):
+    if not user or not await run_in_threadpool(verify_password, user_credentials.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -80,12 +83,12 @@ def login_user(user_credentials: UserLogin, db: Session = Depends(get_db)):
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_info(current_user: User = Depends(get_current_active_user)):
+async def get_current_user_info(current_user: User = Depends(get_current_active_user)):
     """Get current user information"""
     return current_user
 
 @router.get("/users/{user_id}", response_model=UserResponse)
-def get_user(user_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)):
+async def get_user(user_id: int, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_active_user)):
     """Get user by ID (for admin or self)"""
     if current_user.id != user_id:
         raise HTTPException(
@@ -93,7 +96,8 @@ def get_user(user_id: int, db: Session = Depends(get_db), current_user: User = D
             detail="Not enough permissions"
         )
     
-    user = db.query(User).filter(User.id == user_id).first()
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,20 +1,59 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, exists, func, and_, or_, desc, bindparam
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload, raiseload
 from typing import List, Optional
 from datetime import datetime, date
+from uuid import UUID
+from dataclasses import asdict
+import csv
+import io
 
 from app.db.database import get_db
+from app.db.cache import (
+    cache_get, cache_set, monthly_summary_key,
+    SUMMARY_PAST_TTL_SECONDS, SUMMARY_CURRENT_TTL_SECONDS
+)
 from app.models.user import User
+from app.models.account import Account
 from app.models.transaction import Transaction, TransactionStatus
 from app.schemas.transaction import TransactionResponse, TransactionSummary
 from app.core.auth import get_current_active_user
 
 router = APIRouter()
 
+# List endpoints select just the response columns and return plain rows,
+# skipping ORM instance construction and identity-map bookkeeping per row
+_TX_RESPONSE_COLUMNS = [Transaction.__table__.c[name] for name in TransactionResponse.model_fields]
+
+_USER_TXS = select(*_TX_RESPONSE_COLUMNS).where(
+    or_(
+        Transaction.sender_id == bindparam('uid'),
+        Transaction.receiver_id == bindparam('uid')
+    )
+).order_by(desc(Transaction.created_at)).offset(bindparam('offset')).limit(bindparam('limit'))
+_GET_TX = select(Transaction).where(
+    Transaction.transaction_id == bindparam('tid'),
+    or_(
+        Transaction.sender_id == bindparam('uid'),
+        Transaction.receiver_id == bindparam('uid')
+    )
+)
+_OWNS_ACCT = select(exists().where(
+    Account.id == bindparam('aid'),
+    Account.owner_id == bindparam('uid')
+))
+_ACCOUNT_TXS = select(*_TX_RESPONSE_COLUMNS).where(
+    or_(
+        Transaction.sender_account_id == bindparam('aid'),
+        Transaction.receiver_account_id == bindparam('aid')
+    )
+).order_by(desc(Transaction.created_at)).offset(bindparam('offset')).limit(bindparam('limit'))
+
 @router.get("/", response_model=List[TransactionResponse])
-def get_transactions(
-    db: Session = Depends(get_db),
+async def get_transactions(
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
     limit: int = Query(50, le=100),
     offset: int = Query(0, ge=0),
@@ -23,45 +62,33 @@ def get_transactions(
     end_date: Optional[date] = None
 ):
     """Get user's transaction history"""
-    query = db.query(Transaction).filter(
-        or_(
-            Transaction.sender_id == current_user.id,
-            Transaction.receiver_id == current_user.id
-        )
-    )
+    query = _USER_TXS
     
     # Apply filters
     if status:
-        query = query.filter(Transaction.status == status)
+        query = query.where(Transaction.status == status)
     
     if start_date:
-        query = query.filter(Transaction.created_at >= start_date)
+        query = query.where(Transaction.created_at >= start_date)
     
     if end_date:
-        query = query.filter(Transaction.created_at <= end_date)
-    
-    # Order by creation date (newest first)
-    query = query.order_by(desc(Transaction.created_at))
+        query = query.where(Transaction.created_at <= end_date)
     
-    # Apply pagination
-    transactions = query.offset(offset).limit(limit).all()
+    # Newest first, paginated
+    result = await db.execute(query, {'uid': current_user.id, 'offset': offset, 'limit': limit})
+    transactions = result.all()
     
     return transactions
 
 @router.get("/{transaction_id}", response_model=TransactionResponse)
-def get_transaction(
-    transaction_id: str,
-    db: Session = Depends(get_db),
+async def get_transaction(
+    transaction_id: UUID,
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get specific transaction by ID"""
-    transaction = db.query(Transaction).filter(
-        Transaction.transaction_id == transaction_id,
-        or_(
-            Transaction.sender_id == current_user.id,
-            Transaction.receiver_id == current_user.id
-        )
-    ).first()
+    result = await db.execute(_GET_TX, {'tid': transaction_id, 'uid': current_user.id})
+    transaction = result.scalar_one_or_none()
     
     if not transaction:
         raise HTTPException(
@@ -72,96 +99,93 @@ def get_transaction(
     return transaction
 
 @router.get("/account/{account_id}", response_model=List[TransactionResponse])
-def get_account_transactions(
+async def get_account_transactions(
     account_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
     limit: int = Query(50, le=100),
     offset: int = Query(0, ge=0)
 ):
     """Get transactions for a specific account"""
     # Verify account ownership
-    from app.models.account import Account
-    account = db.query(Account).filter(
-        Account.id == account_id,
-        Account.owner_id == current_user.id
-    ).first()
+    owns_account = (await db.execute(_OWNS_ACCT, {'aid': account_id, 'uid': current_user.id})).scalar()
     
-    if not account:
+    if not owns_account:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Account not found"
         )
     
-    transactions = db.query(Transaction).filter(
-        or_(
-            Transaction.sender_account_id == account_id,
-            Transaction.receiver_account_id == account_id
-        )
-    ).order_by(desc(Transaction.created_at)).offset(offset).limit(limit).all()
+    result = await db.execute(_ACCOUNT_TXS, {'aid': account_id, 'offset': offset, 'limit': limit})
+    transactions = result.all()
     
     return transactions
 
 @router.get("/summary/monthly", response_model=TransactionSummary)
-def get_monthly_summary(
-    db: Session = Depends(get_db),
+async def get_monthly_summary(
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
-    year: int = Query(datetime.now().year),
+    year: int = Query(datetime.now().year, ge=1, le=9998),
     month: int = Query(datetime.now().month, ge=1, le=12)
 ):
     """Get monthly transaction summary"""
-    from sqlalchemy import func, extract
-    from decimal import Decimal
-    
-    # Filter transactions for the specified month
-    query = db.query(Transaction).filter(
-        Transaction.sender_id == current_user.id,
-        extract('year', Transaction.created_at) == year,
-        extract('month', Transaction.created_at) == month
+    cache_key = monthly_summary_key(current_user.id, year, month)
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return cached
+    
+    # Half-open range on created_at so the (sender_id, created_at) index applies
+    month_start = datetime(year, month, 1)
+    next_month_start = datetime(year + (month == 12), month % 12 + 1, 1)
+    
+    # Compute every statistic in a single scan over the month's rows;
+    # the status counts use the FILTER clause of the same aggregate pass
+    row = (await db.execute(
+        select(
+            func.count().label('total'),
+            func.coalesce(func.sum(Transaction.amount), 0).label('total_amount'),
+            func.coalesce(func.sum(Transaction.processing_fee), 0).label('total_fees'),
+            func.count().filter(Transaction.status == TransactionStatus.COMPLETED).label('successful'),
+            func.count().filter(Transaction.status == TransactionStatus.FAILED).label('failed')
+        ).where(
+            Transaction.sender_id == current_user.id,
+            Transaction.created_at >= month_start,
+            Transaction.created_at < next_month_start
+        )
+    )).one()
+    
+    summary = TransactionSummary(
+        total_transactions=row.total,
+        total_amount=row.total_amount,
+        total_fees=row.total_fees,
+        successful_transactions=row.successful,
+        failed_transactions=row.failed
     )
     
-    # Calculate summary statistics
-    total_transactions = query.count()
-    
-    # Sum amounts and fees
-    amounts_and_fees = query.with_entities(
-        func.sum(Transaction.amount).label('total_amount'),
-        func.sum(Transaction.processing_fee).label('total_fees')
-    ).first()
-    
-    total_amount = amounts_and_fees.total_amount or Decimal('0')
-    total_fees = amounts_and_fees.total_fees or Decimal('0')
-    
-    # Count successful and failed transactions
-    successful_transactions = query.filter(
-        Transaction.status == TransactionStatus.COMPLETED
-    ).count()
-    
-    failed_transactions = query.filter(
-        Transaction.status == TransactionStatus.FAILED
-    ).count()
-    
-    return TransactionSummary(
-        total_transactions=total_transactions,
-        total_amount=total_amount,
-        total_fees=total_fees,
-        successful_transactions=successful_transactions,
-        failed_transactions=failed_transactions
+    now = datetime.now()
+    is_past_month = (year, month) < (now.year, now.month)
+    await cache_set(
+        cache_key,
+        asdict(summary),
+        SUMMARY_PAST_TTL_SECONDS if is_past_month else SUMMARY_CURRENT_TTL_SECONDS
     )
+    
+    return summary
 
 @router.get("/export/csv")
-def export_transactions_csv(
-    db: Session = Depends(get_db),
+async def export_transactions_csv(
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
     start_date: Optional[date] = None,
     end_date: Optional[date] = None
 ):
     """Export transaction history as CSV"""
-    from fastapi.responses import StreamingResponse
-    import io
-    import csv
-    
-    query = db.query(Transaction).filter(
+    # Batch-load receivers in one IN query instead of one SELECT per row;
+    # raiseload catches any other relationship access added to the loop
+    query = select(Transaction).options(
+        selectinload(Transaction.receiver),
+        raiseload('*')
+    ).where(
         or_(
             Transaction.sender_id == current_user.id,
             Transaction.receiver_id == current_user.id
@@ -169,46 +193,56 @@ def export_transactions_csv(
     )
     
     if start_date:
-        query = query.filter(Transaction.created_at >= start_date)
+        query = query.where(Transaction.created_at >= start_date)
     
     if end_date:
-        query = query.filter(Transaction.created_at <= end_date)
+        query = query.where(Transaction.created_at <= end_date)
     
-    transactions = query.order_by(desc(Transaction.created_at)).all()
+    query = query.order_by(desc(Transaction.created_at)).execution_options(yield_per=1000)
     
-    # Create CSV content
-    output = io.StringIO()
-    writer = csv.writer(output)
-    
-    # Write header
-    writer.writerow([
-        'Transaction ID', 'Date', 'Type', 'Amount', 'Currency', 
-        'Status', 'Description', 'Recipient', 'Fee'
-    ])
-    
-    # Write data
-    for transaction in transactions:
-        recipient = (
-            transaction.external_recipient_name or 
-            (transaction.receiver.full_name if transaction.receiver else 'N/A')
-        )
+    async def generate_csv():
+        # Rows are fetched from a server-side cursor and written out one
+        # batch at a time, so memory stays constant regardless of the range
+        output = io.StringIO()
+        writer = csv.writer(output)
         
+        def flush():
+            chunk = output.getvalue()
+            output.seek(0)
+            output.truncate()
+            return chunk
+        
+        # Write header
         writer.writerow([
-            transaction.transaction_id,
-            transaction.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-            transaction.transaction_type.value,
-            float(transaction.amount),
-            transaction.currency,
-            transaction.status.value,
-            transaction.description or '',
-            recipient,
-            float(transaction.processing_fee)
+            'Transaction ID', 'Date', 'Type', 'Amount', 'Currency', 
+            'Status', 'Description', 'Recipient', 'Fee'
         ])
-    
-    output.seek(0)
+        yield flush()
+        
+        # Write data
+        result = await db.stream_scalars(query)
+        async for transactions in result.partitions():
+            for transaction in transactions:
+                recipient = (
+                    transaction.external_recipient_name or 
+                    (transaction.receiver.full_name if transaction.receiver else 'N/A')
+                )
+                
+                writer.writerow([
+                    transaction.transaction_id,
+                    transaction.created_at.strftime('%Y-%m-%d %H:%M:%S'),
+                    transaction.transaction_type.value,
+                    float(transaction.amount),
+                    transaction.currency,
+                    transaction.status.value,
+                    transaction.description or '',
+                    recipient,
+                    float(transaction.processing_fee)
+                ])
+            yield flush()
     
     return StreamingResponse(
-        io.BytesIO(output.getvalue().encode('utf-8')),
+        generate_csv(),
         media_type='text/csv',
         headers={'Content-Disposition': 'attachment; filename="transactions.csv"'}
     )
\ No newline at end of file
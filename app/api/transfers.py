@@ -1,32 +1,124 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update, insert, exists, func, literal, cast, Date, DateTime
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 import uuid
-from datetime import datetime
 from decimal import Decimal
 
 from app.db.database import get_db
+from app.db.cache import cache_delete, account_balance_key, user_accounts_key, monthly_summary_key
 from app.models.user import User
-from app.models.account import Account
+from app.models.account import Account, DailySpent
 from app.models.transaction import Transaction, TransactionStatus, TransactionType
 from app.schemas.transaction import TransferCreate, TransactionResponse
 from app.core.auth import get_current_active_user
 
 router = APIRouter()
 
-@router.post("/instant", response_model=TransactionResponse)
-def create_instant_transfer(
-    transfer: TransferCreate,
-    sender_account_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
-):
-    """Create an instant transfer"""
-    # Validate sender account
-    sender_account = db.query(Account).filter(
+async def _invalidate_transfer_caches(transaction: Transaction):
+    """Drop cached balances, account lists and the sender's monthly summary touched by a transfer"""
+    account_ids = [transaction.sender_account_id, transaction.receiver_account_id]
+    owner_ids = [transaction.sender_id, transaction.receiver_id]
+    created_at = transaction.created_at
+    await cache_delete(
+        *[account_balance_key(account_id) for account_id in account_ids if account_id],
+        *[user_accounts_key(owner_id) for owner_id in owner_ids if owner_id],
+        monthly_summary_key(transaction.sender_id, created_at.year, created_at.month)
+    )
+
+def _instant_transfer_statement(transfer: TransferCreate, sender_account_id: int, sender_id: int):
+    """Build the single statement that debits, credits and records a transfer
+
+    WITH spent AS (INSERT INTO daily_spent ... ON CONFLICT DO UPDATE ... RETURNING amount),
+         debit AS (UPDATE accounts ... RETURNING id),
+         credit AS (UPDATE accounts ... RETURNING id, owner_id)
+    INSERT INTO transactions ... SELECT ... FROM debit RETURNING *
+
+    Nothing is inserted when either update matched no row.
+    """
+    # Add the amount to today's running total; the upserted row stays locked
+    # until commit, so concurrent transfers from the account queue up here
+    upsert = pg_insert(DailySpent).values(
+        account_id=sender_account_id,
+        day=func.current_date(),
+        amount=transfer.amount
+    )
+    spent = upsert.on_conflict_do_update(
+        index_elements=[DailySpent.account_id, DailySpent.day],
+        set_={"amount": DailySpent.amount + upsert.excluded.amount}
+    ).returning(DailySpent.amount).cte("spent")
+    
+    # The balance and daily limit checks and the write are a single statement,
+    # so concurrent transfers cannot spend the same funds twice or jointly
+    # overrun the limit
+    debit = update(Account).where(
+        Account.id == sender_account_id,
+        Account.owner_id == sender_id,
+        Account.is_active == True,
+        Account.is_blocked == False,
+        Account.balance >= transfer.amount,
+        select(spent.c.amount).scalar_subquery() <= Account.daily_limit
+    ).values(balance=Account.balance - transfer.amount).returning(Account.id).cte("debit")
+    
+    row = {
+        "amount": transfer.amount,
+        "currency": transfer.currency,
+        "description": transfer.description,
+        "transaction_type": transfer.transaction_type,
+        "sender_id": sender_id,
+        "sender_account_id": sender_account_id,
+        "receiver_account_id": transfer.receiver_account_id,
+        "external_recipient_name": transfer.external_recipient_name,
+        "external_recipient_bank": transfer.external_recipient_bank,
+        "external_recipient_account": transfer.external_recipient_account,
+        "external_recipient_document": transfer.external_recipient_document,
+        "pix_key": transfer.pix_key,
+        "processing_fee": Decimal('0.00'),
+        "risk_score": Decimal('1.0'),  # Basic risk assessment
+        "compliance_check": True,
+        "anti_fraud_check": True
+    }
+    columns = Transaction.__table__.c
+    values = {name: literal(value, columns[name].type) for name, value in row.items()}
+    values["processed_at"] = func.now()
+    ctes = [spent, debit]
+    source = select(debit.c.id)
+    
+    if transfer.receiver_account_id:
+        # Credit receiver account (internal), only once the debit went through
+        credit = update(Account).where(
+            Account.id == transfer.receiver_account_id,
+            Account.is_active == True,
+            exists(select(debit.c.id))
+        ).values(balance=Account.balance + transfer.amount).returning(
+            Account.id, Account.owner_id
+        ).cte("credit")
+        ctes.append(credit)
+        source = select(credit.c.id)
+        values["status"] = literal(TransactionStatus.COMPLETED, columns.status.type)
+        values["receiver_id"] = select(credit.c.owner_id).scalar_subquery()
+        values["completed_at"] = func.now()
+    else:
+        # For external transfers, mark as processing
+        # In production, this would integrate with external payment systems
+        values["status"] = literal(TransactionStatus.PROCESSING, columns.status.type)
+    
+    stmt = insert(Transaction).from_select(
+        list(values),
+        select(*values.values()).where(exists(source))
+    ).returning(*columns)
+    for cte in ctes:
+        stmt = stmt.add_cte(cte)
+    return stmt
+
+async def _raise_transfer_rejection(db: AsyncSession, transfer: TransferCreate, sender_account_id: int, sender_id: int):
+    """Work out why the transfer statement matched no row and raise accordingly"""
+    result = await db.execute(select(Account).where(
         Account.id == sender_account_id,
-        Account.owner_id == current_user.id
-    ).first()
+        Account.owner_id == sender_id
+    ))
+    sender_account = result.scalar_one_or_none()
     
     if not sender_account:
         raise HTTPException(
@@ -40,38 +132,8 @@ def create_instant_transfer(
             detail="Sender account is not available for transfers"
         )
     
-    # Check sufficient balance
-    if sender_account.balance < transfer.amount:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Insufficient balance"
-        )
-    
-    # Check daily limit
-    from sqlalchemy import func, and_
-    today = datetime.now().date()
-    daily_total = db.query(func.sum(Transaction.amount)).filter(
-        and_(
-            Transaction.sender_account_id == sender_account_id,
-            func.date(Transaction.created_at) == today,
-            Transaction.status == TransactionStatus.COMPLETED
-        )
-    ).scalar() or Decimal('0')
-    
-    if daily_total + transfer.amount > sender_account.daily_limit:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Daily transfer limit exceeded"
-        )
-    
-    receiver_account = None
-    receiver_user = None
-    
-    # Handle internal transfer (to another account in the system)
     if transfer.receiver_account_id:
-        receiver_account = db.query(Account).filter(
-            Account.id == transfer.receiver_account_id
-        ).first()
+        receiver_account = await db.get(Account, transfer.receiver_account_id)
         
         if not receiver_account:
             raise HTTPException(
@@ -84,19 +146,36 @@ def create_instant_transfer(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Receiver account is not active"
             )
-        
-        receiver_user = db.query(User).filter(
-            User.id == receiver_account.owner_id
-        ).first()
-    
-    # Handle PIX transfer
-    elif transfer.pix_key:
-        # For demonstration, we'll treat PIX as external transfer
-        # In production, you'd integrate with PIX infrastructure
-        pass
-    
-    # Validate external transfer data
-    elif not all([
+    
+    if sender_account.balance < transfer.amount:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Insufficient balance"
+        )
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Daily transfer limit exceeded"
+    )
+
+@router.post("/instant", response_model=TransactionResponse)
+async def create_instant_transfer(
+    transfer: TransferCreate,
+    sender_account_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Create an instant transfer"""
+    sender_id = current_user.id
+    
+    if transfer.receiver_account_id == sender_account_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot transfer to the same account"
+        )
+    
+    # Validate external transfer data. For demonstration, PIX is treated as
+    # an external transfer; in production, you'd integrate with PIX infrastructure
+    if not (transfer.receiver_account_id or transfer.pix_key) and not all([
         transfer.external_recipient_name,
         transfer.external_recipient_bank,
         transfer.external_recipient_account
@@ -106,76 +185,43 @@ def create_instant_transfer(
             detail="Missing recipient information for external transfer"
         )
     
-    # Create transaction record
-    transaction_id = str(uuid.uuid4())
-    
-    db_transaction = Transaction(
-        transaction_id=transaction_id,
-        amount=transfer.amount,
-        currency=transfer.currency,
-        description=transfer.description,
-        transaction_type=transfer.transaction_type,
-        status=TransactionStatus.PROCESSING,
-        sender_id=current_user.id,
-        receiver_id=receiver_user.id if receiver_user else None,
-        sender_account_id=sender_account_id,
-        receiver_account_id=transfer.receiver_account_id,
-        external_recipient_name=transfer.external_recipient_name,
-        external_recipient_bank=transfer.external_recipient_bank,
-        external_recipient_account=transfer.external_recipient_account,
-        external_recipient_document=transfer.external_recipient_document,
-        pix_key=transfer.pix_key,
-        risk_score=Decimal('1.0'),  # Basic risk assessment
-        compliance_check=True,
-        anti_fraud_check=True
-    )
-    
-    db.add(db_transaction)
-    
+    # Debit, credit and transaction record in one round-trip; transaction_id
+    # and timestamps come back through RETURNING
     try:
-        # Process the transfer
-        # Debit sender account
-        sender_account.balance -= transfer.amount
-        
-        # Credit receiver account (if internal)
-        if receiver_account:
-            receiver_account.balance += transfer.amount
-            db_transaction.status = TransactionStatus.COMPLETED
-            db_transaction.completed_at = datetime.utcnow()
-        else:
-            # For external transfers, mark as processing
-            # In production, this would integrate with external payment systems
-            db_transaction.status = TransactionStatus.PROCESSING
-        
-        db_transaction.processed_at = datetime.utcnow()
-        
-        db.commit()
-        db.refresh(db_transaction)
-        
-        return db_transaction
-    
-    except Exception as e:
-        db.rollback()
-        db_transaction.status = TransactionStatus.FAILED
-        db_transaction.error_message = str(e)
-        db.commit()
-        
+        result = await db.execute(
+            select(Transaction).from_statement(
+                _instant_transfer_statement(transfer, sender_account_id, sender_id)
+            )
+        )
+        db_transaction = result.scalar_one_or_none()
+    except Exception:
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Transfer processing failed"
         )
+    
+    if db_transaction is None:
+        await db.rollback()
+        await _raise_transfer_rejection(db, transfer, sender_account_id, sender_id)
+    
+    await db.commit()
+    await _invalidate_transfer_caches(db_transaction)
+    
+    return db_transaction
 
 @router.get("/{transaction_id}", response_model=TransactionResponse)
-def get_transfer_status(
-    transaction_id: str,
-    db: Session = Depends(get_db),
+async def get_transfer_status(
+    transaction_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get transfer status by transaction ID"""
-    transaction = db.query(Transaction).filter(
+    result = await db.execute(select(Transaction).where(
         Transaction.transaction_id == transaction_id,
         (Transaction.sender_id == current_user.id) | (Transaction.receiver_id == current_user.id)
-    ).first()
+    ))
+    transaction = result.scalar_one_or_none()
     
     if not transaction:
         raise HTTPException(
@@ -186,16 +232,19 @@ def get_transfer_status(
     return transaction
 
 @router.post("/{transaction_id}/cancel")
-def cancel_transfer(
-    transaction_id: str,
-    db: Session = Depends(get_db),
+async def cancel_transfer(
+    transaction_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Cancel a pending transfer"""
-    transaction = db.query(Transaction).filter(
+    # Lock the row so concurrent cancels serialize here; the second one then
+    # sees CANCELLED and cannot refund the transfer again
+    result = await db.execute(select(Transaction).where(
         Transaction.transaction_id == transaction_id,
         Transaction.sender_id == current_user.id
-    ).first()
+    ).with_for_update())
+    transaction = result.scalar_one_or_none()
     
     if not transaction:
         raise HTTPException(
@@ -211,21 +260,27 @@ def cancel_transfer(
     
     # Reverse the transaction if it was processing
     if transaction.status == TransactionStatus.PROCESSING:
-        sender_account = db.query(Account).filter(
-            Account.id == transaction.sender_account_id
-        ).first()
-        
-        if sender_account:
-            sender_account.balance += transaction.amount
+        await db.execute(
+            update(Account).where(
+                Account.id == transaction.sender_account_id
+            ).values(balance=Account.balance + transaction.amount)
+        )
+        await db.execute(
+            update(DailySpent).where(
+                DailySpent.account_id == transaction.sender_account_id,
+                DailySpent.day == cast(literal(transaction.created_at, DateTime(timezone=True)), Date)
+            ).values(amount=DailySpent.amount - transaction.amount)
+        )
         
         if transaction.receiver_account_id:
-            receiver_account = db.query(Account).filter(
-                Account.id == transaction.receiver_account_id
-            ).first()
-            if receiver_account:
-                receiver_account.balance -= transaction.amount
+            await db.execute(
+                update(Account).where(
+                    Account.id == transaction.receiver_account_id
+                ).values(balance=Account.balance - transaction.amount)
+            )
     
     transaction.status = TransactionStatus.CANCELLED
-    db.commit()
+    await db.commit()
+    await _invalidate_transfer_caches(transaction)
     
     return {"message": "Transfer cancelled successfully"}
\ No newline at end of file
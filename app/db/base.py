@@ -1,6 +1,6 @@
 # Import all models here for Alembic to detect them
 from app.models.user import User
-from app.models.account import Account
+from app.models.account import Account, DailySpent
 from app.models.transaction import Transaction
 
 from app.db.database import Base
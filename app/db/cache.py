@@ -0,0 +1,62 @@
+import orjson
+from typing import Any, Optional
+
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+
+# Short TTL: balance-changing operations invalidate explicitly, the TTL only
+# bounds staleness for writes that bypass the API
+CACHE_TTL_SECONDS = 30
+
+# Summaries of closed months only change through cancellations, which
+# invalidate them; the current month keeps a short TTL
+SUMMARY_PAST_TTL_SECONDS = 24 * 60 * 60
+SUMMARY_CURRENT_TTL_SECONDS = 60
+
+# Short timeouts so a hung or unreachable Redis raises (and reads miss)
+# instead of blocking requests
+redis_client = aioredis.from_url(
+    settings.REDIS_URL,
+    decode_responses=True,
+    socket_connect_timeout=settings.REDIS_TIMEOUT,
+    socket_timeout=settings.REDIS_TIMEOUT
+) if settings.REDIS_URL else None
+
+def account_balance_key(account_id: int) -> str:
+    return f"acct:{account_id}:balance"
+
+def user_accounts_key(user_id: int) -> str:
+    return f"user:{user_id}:accounts"
+
+def monthly_summary_key(user_id: int, year: int, month: int) -> str:
+    return f"tx:summary:{user_id}:{year}:{month}"
+
+async def cache_get(key: str) -> Optional[Any]:
+    """Get a cached JSON value; None on miss or when Redis is unavailable"""
+    if redis_client is None:
+        return None
+    try:
+        value = await redis_client.get(key)
+    except RedisError:
+        return None
+    return orjson.loads(value) if value is not None else None
+
+async def cache_set(key: str, value: Any, ttl: int = CACHE_TTL_SECONDS) -> None:
+    """Cache a JSON-serializable value (Decimals are stored as strings)"""
+    if redis_client is None:
+        return
+    try:
+        await redis_client.setex(key, ttl, orjson.dumps(value, default=str))
+    except RedisError:
+        pass
+
+async def cache_delete(*keys: str) -> None:
+    """Invalidate cached values"""
+    if redis_client is None or not keys:
+        return
+    try:
+        await redis_client.delete(*keys)
+    except RedisError:
+        pass
\ No newline at end of file
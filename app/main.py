@@ -2,22 +2,36 @@ from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, ORJSONResponse
 
 from app.api import auth, accounts, transfers, transactions
 from app.core.config import settings
 from app.db.database import engine
+from app.db.cache import redis_client
 from app.db.base import Base
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
-    description="SEPA Instant Transfer System for Brazilian Real"
+    description="SEPA Instant Transfer System for Brazilian Real",
+    default_response_class=ORJSONResponse
 )
 
+@app.on_event("startup")
+async def create_tables():
+    # Create database tables
+    if not settings.DB_CREATE_TABLES:
+        return
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+@app.on_event("shutdown")
+async def close_connections():
+    await engine.dispose()
+    if redis_client is not None:
+        await redis_client.aclose()
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -27,6 +41,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress JSON lists and the CSV export; streamed responses such as the
+# CSV are compressed chunk by chunk as rows are produced
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Numeric, Boolean, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Numeric, Boolean, DateTime, Date, ForeignKey, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
@@ -41,4 +41,12 @@ class Account(Base):
     # Relationships
     owner = relationship("User", back_populates="accounts")
     sent_transactions = relationship("Transaction", foreign_keys="Transaction.sender_account_id", back_populates="sender_account")
-    received_transactions = relationship("Transaction", foreign_keys="Transaction.receiver_account_id", back_populates="receiver_account")
\ No newline at end of file
+    received_transactions = relationship("Transaction", foreign_keys="Transaction.receiver_account_id", back_populates="receiver_account")
+
+class DailySpent(Base):
+    """Running total debited from an account per day, checked against daily_limit"""
+    __tablename__ = "daily_spent"
+    
+    account_id = Column(Integer, ForeignKey("accounts.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    amount = Column(Numeric(15, 2), nullable=False, default=0.00)
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Numeric, Boolean, DateTime, ForeignKey, Text, Enum
+from sqlalchemy import Column, Integer, String, Numeric, Boolean, DateTime, ForeignKey, Text, Enum, Index, Uuid
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from enum import Enum as PyEnum
@@ -18,13 +18,16 @@ class TransactionType(PyEnum):
     DEPOSIT = "deposit"
     WITHDRAWAL = "withdrawal"
 
+def _enum_values(enum_cls):
+    return [member.value for member in enum_cls]
+
 class Transaction(Base):
     __tablename__ = "transactions"
     
     id = Column(Integer, primary_key=True, index=True)
     
     # Transaction identification
-    transaction_id = Column(String, unique=True, index=True, nullable=False)  # UUID
+    transaction_id = Column(Uuid(as_uuid=True), server_default=func.gen_random_uuid(), unique=True, index=True, nullable=False)  # Generated by PostgreSQL
     reference_number = Column(String, unique=True, index=True)  # External reference
     
     # Transaction details
@@ -33,8 +36,9 @@ class Transaction(Base):
     description = Column(Text)
     
     # Transaction type and status
-    transaction_type = Column(Enum(TransactionType), nullable=False)
-    status = Column(Enum(TransactionStatus), default=TransactionStatus.PENDING)
+    # Native PostgreSQL enums storing the lowercase values
+    transaction_type = Column(Enum(TransactionType, name="tx_type", values_callable=_enum_values, native_enum=True), nullable=False)
+    status = Column(Enum(TransactionStatus, name="tx_status", values_callable=_enum_values, native_enum=True), default=TransactionStatus.PENDING)
     
     # Sender and receiver information
     sender_id = Column(Integer, ForeignKey("users.id"))
@@ -79,4 +83,12 @@ class Transaction(Base):
     sender = relationship("User", foreign_keys=[sender_id], back_populates="sent_transactions")
     receiver = relationship("User", foreign_keys=[receiver_id], back_populates="received_transactions")
     sender_account = relationship("Account", foreign_keys=[sender_account_id], back_populates="sent_transactions")
-    receiver_account = relationship("Account", foreign_keys=[receiver_account_id], back_populates="received_transactions")
\ No newline at end of file
+    receiver_account = relationship("Account", foreign_keys=[receiver_account_id], back_populates="received_transactions")
+
+# Composite indexes for the per-user list/summary and per-account history
+# queries: each serves its filter and created_at ordering from a single
+# ordered index scan (the OR'd sender/receiver filters use both of a pair)
+Index('ix_tx_sender_created', Transaction.sender_id, Transaction.created_at.desc())
+Index('ix_tx_receiver_created', Transaction.receiver_id, Transaction.created_at.desc())
+Index('ix_tx_sender_acct_created', Transaction.sender_account_id, Transaction.created_at.desc())
+Index('ix_tx_receiver_acct_created', Transaction.receiver_account_id, Transaction.created_at.desc())
\ No newline at end of file
@@ -0,0 +1,8 @@
+from typing import Any, Type, TypeVar
+from pydantic import BaseModel
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+def response_from_orm(model_cls: Type[ModelT], orm_obj: Any) -> ModelT:
+    """Build a response model from a trusted ORM object without validation"""
+    return model_cls.model_construct(**{name: getattr(orm_obj, name) for name in model_cls.model_fields})
\ No newline at end of file
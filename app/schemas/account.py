@@ -1,39 +1,26 @@
-from pydantic import BaseModel, validator
-from typing import Optional
+from pydantic import BaseModel, StringConstraints
+from typing import Annotated, Literal, Optional
 from datetime import datetime
 from decimal import Decimal
 
+# Format checks run inside pydantic-core, without a Python validator call
+BankCode = Annotated[str, StringConstraints(pattern=r'^[0-9]{3}$')]
+BranchCode = Annotated[str, StringConstraints(pattern=r'^[0-9]{4}$')]
+PixKeyType = Literal['cpf', 'email', 'phone', 'random']
+
 class AccountBase(BaseModel):
     account_type: str
-    bank_code: str
-    branch_code: str
+    bank_code: BankCode
+    branch_code: BranchCode
     pix_key: Optional[str] = None
-    pix_key_type: Optional[str] = None
-    
-    @validator('bank_code')
-    def validate_bank_code(cls, v):
-        if len(v) != 3 or not v.isdigit():
-            raise ValueError('Bank code must be 3 digits')
-        return v
-    
-    @validator('branch_code')
-    def validate_branch_code(cls, v):
-        if len(v) != 4 or not v.isdigit():
-            raise ValueError('Branch code must be 4 digits')
-        return v
-    
-    @validator('pix_key_type')
-    def validate_pix_key_type(cls, v):
-        if v and v not in ['cpf', 'email', 'phone', 'random']:
-            raise ValueError('Invalid PIX key type')
-        return v
+    pix_key_type: Optional[PixKeyType] = None
 
 class AccountCreate(AccountBase):
     pass
 
 class AccountUpdate(BaseModel):
     pix_key: Optional[str] = None
-    pix_key_type: Optional[str] = None
+    pix_key_type: Optional[PixKeyType] = None
     daily_limit: Optional[Decimal] = None
     monthly_limit: Optional[Decimal] = None
     is_active: Optional[bool] = None
@@ -1,22 +1,17 @@
-from pydantic import BaseModel, validator
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Annotated, Optional
+from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal
+from uuid import UUID
 from app.models.transaction import TransactionStatus, TransactionType
 
 class TransactionBase(BaseModel):
-    amount: Decimal
+    # Positive, at most 2 decimal places and fits Numeric(15, 2); checked in pydantic-core
+    amount: Annotated[Decimal, Field(gt=0, decimal_places=2, max_digits=15)]
     currency: str = "BRL"
     description: Optional[str] = None
     transaction_type: TransactionType
-    
-    @validator('amount')
-    def validate_amount(cls, v):
-        if v <= 0:
-            raise ValueError('Amount must be positive')
-        if v.as_tuple().exponent < -2:
-            raise ValueError('Amount cannot have more than 2 decimal places')
-        return v
 
 class TransferCreate(TransactionBase):
     receiver_account_id: Optional[int] = None
@@ -32,7 +27,7 @@ class TransactionUpdate(BaseModel):
 
 class TransactionResponse(TransactionBase):
     id: int
-    transaction_id: str
+    transaction_id: UUID
     reference_number: Optional[str] = None
     status: TransactionStatus
     sender_id: Optional[int] = None
@@ -55,7 +50,9 @@ class TransactionResponse(TransactionBase):
     class Config:
         from_attributes = True
 
-class TransactionSummary(BaseModel):
+@dataclass(slots=True, frozen=True)
+class TransactionSummary:
+    """Monthly aggregates straight from the database; nothing to validate"""
     total_transactions: int
     total_amount: Decimal
     total_fees: Decimal
@@ -1,6 +1,7 @@
-from pydantic import BaseModel, EmailStr, validator
+from pydantic import BaseModel, EmailStr, field_validator
 from typing import Optional
 from datetime import datetime
+from app.utils.validators import validate_cpf as _validate_cpf, validate_cnpj as _validate_cnpj
 
 class UserBase(BaseModel):
     email: EmailStr
@@ -12,20 +13,18 @@ class UserBase(BaseModel):
 class UserCreate(UserBase):
     password: str
     
-    @validator('cpf')
+    @field_validator('cpf')
+    @classmethod
     def validate_cpf(cls, v):
-        if v:
-            from app.utils.validators import validate_cpf
-            if not validate_cpf(v):
-                raise ValueError('Invalid CPF')
+        if v and not _validate_cpf(v):
+            raise ValueError('Invalid CPF')
         return v
     
-    @validator('cnpj')
+    @field_validator('cnpj')
+    @classmethod
     def validate_cnpj(cls, v):
-        if v:
-            from app.utils.validators import validate_cnpj
-            if not validate_cnpj(v):
-                raise ValueError('Invalid CNPJ')
+        if v and not _validate_cnpj(v):
+            raise ValueError('Invalid CNPJ')
         return v
 
 class UserUpdate(BaseModel):
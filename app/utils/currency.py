@@ -1,34 +1,34 @@
-from decimal import Decimal
+from decimal import Decimal, InvalidOperation, ROUND_DOWN
+from functools import lru_cache
 import locale
+import secrets
 from typing import Union
 
+# Shared Decimal constants; Decimals are immutable, so one instance serves every call
+_ZERO = Decimal('0.00')
+_CENT = Decimal('0.01')
+# Numeric(15, 2) leaves 13 integer digits
+_MAX_AMOUNT = Decimal('1E13')
+
+# Swaps US-style separators for Brazilian ones
+_BR_TRANS = str.maketrans({',': '.', '.': ','})
+# Characters removed when parsing a Brazilian-formatted amount
+_PARSE_DROP = str.maketrans('', '', 'R$ .')
+
+@lru_cache(maxsize=4096)
 def format_currency_brl(amount: Union[Decimal, float, int]) -> str:
-    """Format amount as Brazilian Real currency (R$ 1.234,56)"""
+    """Format amount as Brazilian Real currency (R$ 1.234,56)
+    
+    Pure function of the amount, so results are memoized.
+    """
     try:
         # Ensure we have a Decimal for precise calculation
         if not isinstance(amount, Decimal):
             amount = Decimal(str(amount))
         
-        # Format with Brazilian locale-style
-        # Convert to float for formatting (careful with precision)
-        amount_float = float(amount)
-        
-        # Format with 2 decimal places and Brazilian number format
-        formatted = f"{amount_float:,.2f}"
-        
-        # Replace commas and dots to match Brazilian format
-        # Brazilian format: 1.234.567,89 (dots for thousands, comma for decimal)
-        parts = formatted.split('.')
-        if len(parts) == 2:
-            integer_part = parts[0]
-            decimal_part = parts[1]
-            
-            # Add dots as thousand separators
-            if ',' in integer_part:
-                integer_part = integer_part.replace(',', '.')
-            
-            # Use comma as decimal separator
-            formatted = f"{integer_part},{decimal_part}"
+        # Format the Decimal directly (no float round-trip), then swap the
+        # separators to the Brazilian format: 1.234.567,89
+        formatted = format(amount, ',.2f').translate(_BR_TRANS)
         
         return f"R$ {formatted}"
     except (ValueError, TypeError):
@@ -37,39 +37,28 @@ def format_currency_brl(amount: Union[Decimal, float, int]) -> str:
 def parse_currency_brl(currency_str: str) -> Decimal:
     """Parse Brazilian currency string to Decimal"""
     if not currency_str:
-        return Decimal('0.00')
-    
-    # Remove currency symbol and spaces
-    amount_str = currency_str.replace('R$', '').replace(' ', '')
+        return _ZERO
     
-    # Handle Brazilian number format (dots for thousands, comma for decimal)
-    # First, handle the decimal separator (comma)
-    if ',' in amount_str:
-        parts = amount_str.rsplit(',', 1)  # Split on last comma
-        if len(parts) == 2:
-            integer_part = parts[0].replace('.', '')  # Remove thousand separators
-            decimal_part = parts[1]
-            amount_str = f"{integer_part}.{decimal_part}"
-    else:
-        # No decimal part, just remove dots (thousand separators)
-        amount_str = amount_str.replace('.', '')
+    # Drop the currency symbol, spaces and thousand separators in one pass,
+    # then turn the decimal comma into a point
+    amount_str = currency_str.translate(_PARSE_DROP).replace(',', '.')
     
     try:
         return Decimal(amount_str)
     except (ValueError, TypeError):
-        return Decimal('0.00')
+        return _ZERO
 
 def validate_currency_amount(amount: Union[str, Decimal, float]) -> bool:
     """Validate if amount is a valid currency value"""
     try:
-        if isinstance(amount, str):
-            amount = parse_currency_brl(amount)
-        elif not isinstance(amount, Decimal):
-            amount = Decimal(str(amount))
+        # Decimals (the common case) are checked as they are
+        if not isinstance(amount, Decimal):
+            amount = parse_currency_brl(amount) if isinstance(amount, str) else Decimal(str(amount))
         
-        # Check if amount is positive and has at most 2 decimal places
-        return amount > 0 and amount.as_tuple().exponent >= -2
-    except (ValueError, TypeError):
+        # Check if amount is positive, fits Numeric(15, 2) and has at most
+        # 2 decimal places (truncating to cents leaves it unchanged)
+        return 0 < amount < _MAX_AMOUNT and amount.quantize(_CENT, rounding=ROUND_DOWN) == amount
+    except (ValueError, TypeError, InvalidOperation):
         return False
 
 def format_account_number(bank_code: str, branch_code: str, account_number: str) -> str:
@@ -78,17 +67,14 @@ def format_account_number(bank_code: str, branch_code: str, account_number: str)
 
 def generate_account_number() -> str:
     """Generate a new account number"""
-    import random
-    import string
-    
-    # Generate 8-digit account number
-    return ''.join(random.choices(string.digits, k=8))
+    # Generate 8-digit account number from a CSPRNG
+    return f"{secrets.randbelow(100_000_000):08d}"
+
+# Brazil doesn't use IBAN, but we can create a compatible format for
+# international transfers: country code plus check digits, which would need
+# proper calculation for a real IBAN
+_IBAN_PREFIX = "BR00"
 
 def generate_iban_compatible(bank_code: str, branch_code: str, account_number: str) -> str:
     """Generate IBAN-compatible format for Brazilian accounts"""
-    # Brazil doesn't use IBAN, but we can create a compatible format
-    # for international transfers
-    country_code = "BR"
-    check_digits = "00"  # Would need proper calculation for real IBAN
-    
-    return f"{country_code}{check_digits}{bank_code}{branch_code}{account_number.zfill(12)}"
\ No newline at end of file
+    return f"{_IBAN_PREFIX}{bank_code}{branch_code}{account_number.zfill(12)}"
\ No newline at end of file
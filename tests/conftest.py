@@ -1,61 +1,124 @@
+import asyncio
+import uuid
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.main import app
 from app.db.database import get_db, Base
 from app.core.config import settings
 
-# Test database URL (use SQLite for testing)
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+# Test database URL (use in-memory SQLite for testing); StaticPool keeps the
+# single connection, and with it the database, alive for the whole run
+SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite://"
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+engine = create_async_engine(
+    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}, poolclass=StaticPool
 )
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingSessionLocal = async_sessionmaker(engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
 
-def override_get_db():
-    try:
-        db = TestingSessionLocal()
-        yield db
-    finally:
-        db.close()
+# SQLite stand-in for PostgreSQL's gen_random_uuid() server default. pysqlite's
+# implicit transaction handling is turned off so SAVEPOINTs work; BEGIN is
+# emitted explicitly instead
+@event.listens_for(engine.sync_engine, "connect")
+def register_sqlite_functions(dbapi_connection, connection_record):
+    dbapi_connection.create_function("gen_random_uuid", 0, lambda: uuid.uuid4().hex)
+    dbapi_connection.isolation_level = None
+
+@event.listens_for(engine.sync_engine, "begin")
+def begin_sqlite_transaction(conn):
+    conn.exec_driver_sql("BEGIN")
+
+# The schema is created on the test engine below; the app's startup hook
+# would otherwise run create_all against the configured DATABASE_URL
+settings.DB_CREATE_TABLES = False
+
+async def _create_schema():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
 
-app.dependency_overrides[get_db] = override_get_db
+async def _begin_test_transaction():
+    connection = await engine.connect()
+    await connection.begin()
+    return connection
+
+async def _rollback_test_transaction(connection):
+    await connection.rollback()
+    await connection.close()
+
+@pytest.fixture(scope="session")
+def test_db():
+    asyncio.run(_create_schema())
+    yield
+    asyncio.run(engine.dispose())
 
 @pytest.fixture
-def client():
-    Base.metadata.create_all(bind=engine)
+def client(test_db):
     with TestClient(app) as client:
-        yield client
-    Base.metadata.drop_all(bind=engine)
+        # Each test runs in one outer transaction that is rolled back at the
+        # end; commits inside the app only release SAVEPOINTs
+        connection = client.portal.call(_begin_test_transaction)
+        
+        async def override_get_db():
+            async with TestingSessionLocal(bind=connection, join_transaction_mode="create_savepoint") as db:
+                yield db
+        
+        app.dependency_overrides[get_db] = override_get_db
+        try:
+            yield client
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            client.portal.call(_rollback_test_transaction, connection)
 
-@pytest.fixture
-def auth_headers(client):
-    # Create a test user and get auth token
+async def _committing_get_db():
+    async with TestingSessionLocal() as db:
+        yield db
+
+# Tokens of users registered once per run, by email. Test modules import the
+# fixture, which gives each module its own session-scoped instance, so the
+# cache is what keeps registration (and its bcrypt hash) to once per run
+_auth_tokens = {}
+
+@pytest.fixture(scope="session")
+def auth_headers(test_db):
+    # Create a test user and get auth token. It is committed and outlives
+    # every test, so no test may register this email or username itself
     user_data = {
-        "email": "test@example.com",
-        "username": "testuser",
-        "full_name": "Test User",
-        "cpf": "12345678901",
+        "email": "session-user@example.com",
+        "username": "sessionuser",
+        "full_name": "Session User",
+        "cpf": "52998224725",
         "password": "testpassword"
     }
     
-    # Register user
-    response = client.post("/api/auth/register", json=user_data)
-    assert response.status_code == 200
-    
-    # Login to get token
-    login_data = {
-        "email": "test@example.com",
-        "password": "testpassword"
-    }
-    response = client.post("/api/auth/login", json=login_data)
-    assert response.status_code == 200
+    if user_data["email"] not in _auth_tokens:
+        # Registered outside the per-test transaction so the user outlives it
+        previous_override = app.dependency_overrides.get(get_db)
+        app.dependency_overrides[get_db] = _committing_get_db
+        try:
+            with TestClient(app) as client:
+                # Register user
+                response = client.post("/api/auth/register", json=user_data)
+                assert response.status_code == 200
+                
+                # Login to get token
+                login_data = {
+                    "email": user_data["email"],
+                    "password": user_data["password"]
+                }
+                response = client.post("/api/auth/login", json=login_data)
+                assert response.status_code == 200
+                
+                _auth_tokens[user_data["email"]] = response.json()["access_token"]
+        finally:
+            if previous_override is None:
+                app.dependency_overrides.pop(get_db, None)
+            else:
+                app.dependency_overrides[get_db] = previous_override
     
-    token = response.json()["access_token"]
-    return {"Authorization": f"Bearer {token}"}
+    return {"Authorization": f"Bearer {_auth_tokens[user_data['email']]}"}
 
 def test_health_check(client):
     response = client.get("/health")
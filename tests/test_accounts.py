@@ -60,6 +60,23 @@ def test_get_account_balance(client, auth_headers):
     assert "formatted_balance" in response.json()
     assert response.json()["currency"] == "BRL"
 
+def test_update_account_invalid_pix_key_type(client, auth_headers):
+    account_data = {
+        "account_type": "checking",
+        "bank_code": "001",
+        "branch_code": "1234",
+    }
+    
+    create_response = client.post("/api/accounts/", json=account_data, headers=auth_headers)
+    account_id = create_response.json()["id"]
+    
+    # Rejected before the write, so the account list stays readable
+    response = client.put(f"/api/accounts/{account_id}", json={"pix_key_type": ""}, headers=auth_headers)
+    assert response.status_code == 422
+    
+    response = client.get("/api/accounts/", headers=auth_headers)
+    assert response.status_code == 200
+
 def test_get_account_unauthorized(client):
     response = client.get("/api/accounts/")
     assert response.status_code == 401
\ No newline at end of file
@@ -67,7 +67,7 @@ def test_login_invalid_credentials(client):
 def test_get_current_user(client, auth_headers):
     response = client.get("/api/auth/me", headers=auth_headers)
     assert response.status_code == 200
-    assert response.json()["email"] == "test@example.com"
+    assert response.json()["email"] == "session-user@example.com"
 
 def test_get_current_user_unauthorized(client):
     response = client.get("/api/auth/me")
@@ -0,0 +1,182 @@
+import asyncio
+import os
+import pytest
+from decimal import Decimal
+from fastapi.testclient import TestClient
+from sqlalchemy import select, update
+from sqlalchemy.pool import NullPool
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.main import app
+from app.db.database import get_db, Base
+from app.models.account import Account, DailySpent
+
+# The transfer statement relies on PostgreSQL (writable CTEs, ON CONFLICT),
+# so these run only against a dedicated database named by TEST_DATABASE_URL,
+# never the app's DATABASE_URL
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(
+    not TEST_DATABASE_URL,
+    reason="TEST_DATABASE_URL is not set"
+)
+
+user_data = {
+    "email": "transfers@example.com",
+    "username": "transfers",
+    "full_name": "Transfer User",
+    "cpf": "11144477735",
+    "password": "testpassword"
+}
+
+async def _create_schema():
+    engine = create_async_engine(TEST_DATABASE_URL, poolclass=NullPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await engine.dispose()
+
+async def _begin_test_transaction(engine):
+    connection = await engine.connect()
+    await connection.begin()
+    return connection
+
+async def _rollback_test_transaction(connection):
+    engine = connection.engine
+    await connection.rollback()
+    await connection.close()
+    await engine.dispose()
+
+async def _execute(connection, statement):
+    result = await connection.execute(statement)
+    return result.all() if result.returns_rows else None
+
+@pytest.fixture(scope="module")
+def pg_db():
+    asyncio.run(_create_schema())
+
+@pytest.fixture
+def pg_connection(pg_db):
+    # Same per-test outer transaction as the client fixture, against the
+    # PostgreSQL test database
+    with TestClient(app) as client:
+        engine = create_async_engine(TEST_DATABASE_URL, poolclass=NullPool)
+        connection = client.portal.call(_begin_test_transaction, engine)
+        PgSessionLocal = async_sessionmaker(connection, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+        
+        async def override_get_db():
+            async with PgSessionLocal(join_transaction_mode="create_savepoint") as db:
+                yield db
+        
+        previous_override = app.dependency_overrides.get(get_db)
+        app.dependency_overrides[get_db] = override_get_db
+        try:
+            yield client, connection
+        finally:
+            if previous_override is None:
+                app.dependency_overrides.pop(get_db, None)
+            else:
+                app.dependency_overrides[get_db] = previous_override
+            client.portal.call(_rollback_test_transaction, connection)
+
+@pytest.fixture
+def pg_client(pg_connection):
+    return pg_connection[0]
+
+@pytest.fixture
+def pg_execute(pg_connection):
+    """Run a statement inside the test transaction, for seeding and checks"""
+    client, connection = pg_connection
+    return lambda statement: client.portal.call(_execute, connection, statement)
+
+@pytest.fixture
+def pg_headers(pg_client):
+    response = pg_client.post("/api/auth/register", json=user_data)
+    assert response.status_code == 200
+    
+    response = pg_client.post("/api/auth/login", json={
+        "email": user_data["email"],
+        "password": user_data["password"]
+    })
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+def _create_account(client, execute, headers, balance="0.00", **values):
+    response = client.post("/api/accounts/", json={
+        "account_type": "checking",
+        "bank_code": "001",
+        "branch_code": "1234"
+    }, headers=headers)
+    assert response.status_code == 200
+    account_id = response.json()["id"]
+    execute(update(Account).where(Account.id == account_id).values(balance=Decimal(balance), **values))
+    return account_id
+
+def _transfer(client, headers, sender_account_id, receiver_account_id, amount):
+    return client.post(
+        f"/api/transfers/instant?sender_account_id={sender_account_id}",
+        json={
+            "amount": amount,
+            "transaction_type": "instant_transfer",
+            "receiver_account_id": receiver_account_id
+        },
+        headers=headers
+    )
+
+def _balance(execute, account_id):
+    return execute(select(Account.balance).where(Account.id == account_id))[0][0]
+
+def _daily_spent(execute, account_id):
+    return [row[0] for row in execute(select(DailySpent.amount).where(DailySpent.account_id == account_id))]
+
+def test_instant_transfer_success(pg_client, pg_execute, pg_headers):
+    sender_id = _create_account(pg_client, pg_execute, pg_headers, balance="100.00")
+    receiver_id = _create_account(pg_client, pg_execute, pg_headers)
+    
+    response = _transfer(pg_client, pg_headers, sender_id, receiver_id, "40.00")
+    assert response.status_code == 200
+    assert response.json()["status"] == "completed"
+    assert response.json()["amount"] == "40.00"
+    assert _balance(pg_execute, sender_id) == Decimal("60.00")
+    assert _balance(pg_execute, receiver_id) == Decimal("40.00")
+    assert _daily_spent(pg_execute, sender_id) == [Decimal("40.00")]
+
+def test_instant_transfer_insufficient_balance(pg_client, pg_execute, pg_headers):
+    sender_id = _create_account(pg_client, pg_execute, pg_headers, balance="10.00")
+    receiver_id = _create_account(pg_client, pg_execute, pg_headers)
+    
+    response = _transfer(pg_client, pg_headers, sender_id, receiver_id, "40.00")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Insufficient balance"
+    assert _balance(pg_execute, sender_id) == Decimal("10.00")
+    assert _balance(pg_execute, receiver_id) == Decimal("0.00")
+
+def test_instant_transfer_daily_limit_exceeded(pg_client, pg_execute, pg_headers):
+    sender_id = _create_account(pg_client, pg_execute, pg_headers, balance="100.00", daily_limit=Decimal("50.00"))
+    receiver_id = _create_account(pg_client, pg_execute, pg_headers)
+    
+    assert _transfer(pg_client, pg_headers, sender_id, receiver_id, "30.00").status_code == 200
+    
+    response = _transfer(pg_client, pg_headers, sender_id, receiver_id, "30.00")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Daily transfer limit exceeded"
+    assert _balance(pg_execute, sender_id) == Decimal("70.00")
+
+def test_instant_transfer_inactive_receiver(pg_client, pg_execute, pg_headers):
+    sender_id = _create_account(pg_client, pg_execute, pg_headers, balance="100.00")
+    receiver_id = _create_account(pg_client, pg_execute, pg_headers, is_active=False)
+    
+    response = _transfer(pg_client, pg_headers, sender_id, receiver_id, "40.00")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Receiver account is not active"
+    assert _balance(pg_execute, sender_id) == Decimal("100.00")
+
+def test_instant_transfer_rejection_keeps_daily_spent(pg_client, pg_execute, pg_headers):
+    sender_id = _create_account(pg_client, pg_execute, pg_headers, balance="50.00")
+    receiver_id = _create_account(pg_client, pg_execute, pg_headers)
+    
+    assert _transfer(pg_client, pg_headers, sender_id, receiver_id, "20.00").status_code == 200
+    
+    # The upsert ran before the debit failed; the rollback must undo it
+    response = _transfer(pg_client, pg_headers, sender_id, receiver_id, "40.00")
+    assert response.status_code == 400
+    assert _daily_spent(pg_execute, sender_id) == [Decimal("20.00")]
\ No newline at end of file
@@ -37,6 +37,10 @@ def test_validate_pix_key():
     assert validate_pix_key("11144477735", "cpf") == True
     assert validate_pix_key("+5511999999999", "phone") == True
     assert validate_pix_key("invalid-email", "email") == False
+    assert validate_pix_key("123e4567-e89b-42d3-a456-426614174000", "random") == True
+    assert validate_pix_key("123E4567-E89B-42D3-A456-426614174000", "random") == True  # Upper case
+    assert validate_pix_key("123e4567-e89b-42d3-a456-426614174000\n", "random") == False  # Trailing newline
+    assert validate_pix_key("test@example.com\n", "email") == False
 
 def test_format_currency_brl():
     assert format_currency_brl(Decimal("1234.56")) == "R$ 1.234,56"
@@ -53,4 +57,11 @@ def test_validate_currency_amount():
     assert validate_currency_amount(Decimal("100.50")) == True
     assert validate_currency_amount("R$ 100,50") == True
     assert validate_currency_amount(Decimal("0")) == False  # Not positive
-    assert validate_currency_amount(Decimal("100.555")) == False  # Too many decimals
\ No newline at end of file
+    assert validate_currency_amount(Decimal("100.555")) == False  # Too many decimals
+    assert validate_currency_amount(Decimal("1.000")) == True  # Trailing zeros
+    assert validate_currency_amount("abc") == False
+    assert validate_currency_amount(float("nan")) == False
+    assert validate_currency_amount(Decimal("9999999999999.99")) == True  # Largest Numeric(15, 2) value
+    assert validate_currency_amount(Decimal("1E+13")) == False  # Too large for Numeric(15, 2)
+    assert validate_currency_amount(Decimal("1E+20")) == False
+    assert validate_currency_amount(Decimal("1E+30")) == False
\ No newline at end of file